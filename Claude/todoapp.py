@@ -1,45 +1,280 @@
 import json
+import mmap
 import os
-from datetime import datetime
+import re
+import sys
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass
+from datetime import date, datetime
+from typing import Optional
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+if orjson is not None:
+    _dumps = orjson.dumps
+    _loads = orjson.loads
+else:
+    def _dumps(obj):
+        return json.dumps(obj, default=asdict).encode()
+
+    _loads = json.loads
+
+# Row templates for the listings in main()
+_STATUS = {True: "✓", False: " "}
+_ROW_ALL = "ID: {} [{}] {} (Priority: {}, Due: {})\n"
+_ROW_COMPLETED = "ID: {} {} (Priority: {})\n"
+_ROW_PENDING = "ID: {} {} (Priority: {}, Due: {})\n"
+
+# date.fromisoformat also accepts forms like '20240101'; keep input strict
+_DATE_RE = re.compile(r'^\d{4}-\d{2}-\d{2}$')
+
+
+@dataclass(slots=True, eq=False)
+class Task:
+    """
+    A single todo item. Serialized as a JSON object with the same field names.
+    Ids are unique, so tasks compare by identity.
+    """
+    id: int
+    description: str
+    completed: bool
+    priority: str
+    due_date: Optional[str]
+    created_at: str
 
 
 class TodoTaskTool:
     def __init__(self, filename='tasks.json'):
         """
-        Initialize the Todo Task Tool with a JSON file for persistent storage.
+        Initialize the Todo Task Tool with a JSON Lines event log for
+        persistent storage.
 
         Args:
             filename (str): Name of the file to store tasks (default: 'tasks.json')
         """
         self.filename = filename
-        self.tasks = self.load_tasks()
+        self._event_count = 0
+        self._last_id = 0
+        # The log is replayed on first access to tasks, not here
+        self._by_id = None
+        self._next_id = None
+        self._deferred = 0
+        self._pending_events = []
+
+    @property
+    def tasks(self):
+        """
+        list: All tasks in id order, loaded from the log on first access.
+        """
+        self._ensure_loaded()
+        return list(self._by_id.values())
+
+    def _ensure_loaded(self):
+        """
+        Replay the log and build the lookup tables if not done yet.
+        """
+        if self._by_id is not None:
+            return
+        # Insertion-ordered id -> task dict; the only store of live tasks
+        self._by_id = {task.id: task for task in self.load_tasks()}
+        self._next_id = max(self._next_id or 0, self._last_id + 1)
+        # id -> task partitions so filtered listings skip the full scan
+        self._completed = {i: t for i, t in self._by_id.items() if t.completed}
+        self._pending = {i: t for i, t in self._by_id.items() if not t.completed}
+        if self._event_count is None:
+            # Legacy or torn file; rewrite it as a clean log before appending
+            self.compact()
 
     def load_tasks(self):
         """
-        Load tasks from the JSON file. Create an empty list if file doesn't exist.
+        Load tasks by replaying the event log. Create an empty list if file
+        doesn't exist.
+
+        Each line is one JSON event: {"op": "add", "task": {...}},
+        {"op": "complete", "id": ...} or {"op": "remove", "id": ...}.
+        Compaction also writes {"op": "next_id", "id": ...} so ids of removed
+        tasks are not handed out again.
+        A file holding a single JSON array (the old format) is also accepted.
+        A truncated last line, left by a crash during an append, is dropped,
+        and a log whose last line has no newline is compacted before use.
 
         Returns:
-            list: List of tasks
+            list: List of Task objects
         """
-        if not os.path.exists(self.filename):
+        if not os.path.exists(self.filename) or os.path.getsize(self.filename) == 0:
             return []
 
         try:
-            with open(self.filename, 'r') as f:
-                return json.load(f)
-        except (json.JSONDecodeError, IOError):
+            # Map the file rather than reading it into one buffer; the OS pages
+            # lines in as they are parsed
+            with open(self.filename, 'rb') as f, \
+                    mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                if mm.readline().lstrip().startswith(b'['):
+                    tasks = [Task(**task) for task in _loads(mm[:])]
+                    # Flag for conversion only once the whole file has parsed
+                    self._event_count = None
+                    self._last_id = max((task.id for task in tasks), default=0)
+                    return tasks
+                mm.seek(0)
+
+                by_id = {}
+                count = 0
+                last_id = 0
+                for line in iter(mm.readline, b''):
+                    if not line.strip():
+                        continue
+                    try:
+                        event = _loads(line)
+                    except ValueError:
+                        # JSONDecodeError, or UnicodeDecodeError from the stdlib
+                        # parser when the cut split a multi-byte character
+                        if line.endswith(b'\n'):
+                            raise
+                        count = None
+                        break
+                    op = event['op']
+                    if op == 'next_id':
+                        last_id = max(last_id, event['id'] - 1)
+                        continue
+                    count += 1
+                    if op == 'add':
+                        task = Task(**event['task'])
+                        by_id[task.id] = task
+                        last_id = max(last_id, task.id)
+                    elif op == 'complete':
+                        task = by_id.get(event['id'])
+                        if task is not None:
+                            task.completed = True
+                    elif op == 'remove':
+                        by_id.pop(event['id'], None)
+                if count is not None and mm[-1:] != b'\n':
+                    # The last append lost its newline; rewrite before the
+                    # next append gets joined onto it
+                    count = None
+            self._event_count = count
+            self._last_id = last_id
+            return list(by_id.values())
+        except (ValueError, KeyError, TypeError, IOError):
             print(f"Error reading {self.filename}. Starting with an empty task list.")
             return []
 
-    def save_tasks(self):
+    def _read_next_id(self):
         """
-        Save tasks to the JSON file.
+        Find the next free id from the last 'add' or 'next_id' event in the
+        log, reading backwards from the end of the file instead of replaying it.
+
+        Returns:
+            int or None: Next id, or None if the file needs a full load
+        """
+        if not os.path.exists(self.filename) or os.path.getsize(self.filename) == 0:
+            return 1
+
+        try:
+            with open(self.filename, 'rb') as f, \
+                    mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                if mm.readline().lstrip().startswith(b'[') or mm[-1:] != b'\n':
+                    return None
+                end = len(mm) - 1
+                while end > 0:
+                    start = mm.rfind(b'\n', 0, end) + 1
+                    line = mm[start:end]
+                    if line.strip():
+                        event = _loads(line)
+                        if event['op'] == 'add':
+                            return event['task']['id'] + 1
+                        if event['op'] == 'next_id':
+                            return event['id']
+                    end = start - 1
+            return 1
+        except (ValueError, KeyError, TypeError, IOError):
+            return None
+
+    def _append_events(self, events):
         """
+        Append events to the log in a single write, compacting it once it
+        has grown to more than twice the number of live tasks.
+
+        Args:
+            events (list): Event dicts to append
+        """
+        if self._event_count is None:
+            # An earlier compaction failed and the log may end mid-line;
+            # appending now would glue this event onto it
+            self.compact()
+            if self._event_count is None:
+                return
+        data = b''.join(_dumps(event) + b'\n' for event in events)
         try:
-            with open(self.filename, 'w') as f:
-                json.dump(self.tasks, f, indent=2)
+            with open(self.filename, 'ab') as f:
+                f.write(data)
         except IOError:
             print(f"Error saving tasks to {self.filename}")
+            return
+        if self._by_id is None:
+            # Not replayed yet; the count is rebuilt on load
+            return
+        self._event_count += len(events)
+        if self._event_count > len(self._by_id) * 2:
+            self.compact()
+
+    def compact(self):
+        """
+        Atomically rewrite the log as one 'add' event per current task,
+        followed by a 'next_id' record.
+        Does nothing if the log already holds exactly one event per task.
+        """
+        self._ensure_loaded()
+        if self._event_count == len(self._by_id):
+            return
+        tmp = self.filename + '.tmp'
+        events = [{'op': 'add', 'task': task} for task in self._by_id.values()]
+        events.append({'op': 'next_id', 'id': self._next_id})
+        data = b''.join(_dumps(event) + b'\n' for event in events)
+        try:
+            with open(tmp, 'wb') as f:
+                f.write(data)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp, self.filename)
+        except IOError:
+            print(f"Error saving tasks to {self.filename}")
+            return
+        self._event_count = len(self._by_id)
+
+    def _persist(self, event):
+        """
+        Append an event now, or queue it if a batch is in progress.
+
+        Args:
+            event (dict): Event describing the mutation
+        """
+        if self._deferred:
+            self._pending_events.append(event)
+        else:
+            self._append_events([event])
+
+    @contextmanager
+    def batch(self):
+        """
+        Defer saving until the outermost batch exits, so a run of
+        mutations is written to disk once instead of once per call.
+
+        Example:
+            with todo.batch():
+                for line in lines:
+                    todo.add_task(line)
+        """
+        self._deferred += 1
+        try:
+            yield self
+        finally:
+            self._deferred -= 1
+            if not self._deferred and self._pending_events:
+                events, self._pending_events = self._pending_events, []
+                self._append_events(events)
 
     def add_task(self, description, priority='medium', due_date=None):
         """
@@ -51,7 +286,7 @@ class TodoTaskTool:
             due_date (str, optional): Due date in YYYY-MM-DD format
 
         Returns:
-            dict: The newly created task
+            Task: The newly created task
         """
         # Validate priority
         priority = priority.lower()
@@ -60,23 +295,37 @@ class TodoTaskTool:
 
         # Validate due date
         if due_date:
-            try:
-                datetime.strptime(due_date, '%Y-%m-%d')
-            except ValueError:
+            match = _DATE_RE.match(due_date)
+            if match is not None:
+                try:
+                    date.fromisoformat(due_date)
+                except ValueError:
+                    match = None
+            if match is None:
                 print("Invalid date format. Use YYYY-MM-DD. No due date set.")
                 due_date = None
 
-        task = {
-            'id': len(self.tasks) + 1,
-            'description': description,
-            'completed': False,
-            'priority': priority,
-            'due_date': due_date,
-            'created_at': datetime.now().strftime('%Y-%m-%d %H:%M:%S')
-        }
-
-        self.tasks.append(task)
-        self.save_tasks()
+        # Outside a batch, a new task only needs the next id, which can be
+        # read from the end of the log without loading every task
+        if self._by_id is None and self._next_id is None and not self._deferred:
+            self._next_id = self._read_next_id()
+        if self._next_id is None or self._deferred:
+            self._ensure_loaded()
+
+        task = Task(
+            id=self._next_id,
+            description=description,
+            completed=False,
+            priority=priority,
+            due_date=due_date,
+            created_at=datetime.now().isoformat(' ', 'seconds')
+        )
+
+        self._next_id += 1
+        if self._by_id is not None:
+            self._by_id[task.id] = task
+            self._pending[task.id] = task
+        self._persist({'op': 'add', 'task': task})
         return task
 
     def list_tasks(self, filter_type=None):
@@ -89,10 +338,13 @@ class TodoTaskTool:
         Returns:
             list: Filtered list of tasks
         """
+        self._ensure_loaded()
         if filter_type == 'completed':
-            return [task for task in self.tasks if task['completed']]
+            # Completion order differs from id order, so sort to match a scan
+            return [self._completed[i] for i in sorted(self._completed)]
         elif filter_type == 'pending':
-            return [task for task in self.tasks if not task['completed']]
+            # Tasks are added in id order and never re-enter pending
+            return list(self._pending.values())
         return self.tasks
 
     def mark_task_complete(self, task_id):
@@ -105,11 +357,16 @@ class TodoTaskTool:
         Returns:
             bool: True if task was found and marked, False otherwise
         """
-        for task in self.tasks:
-            if task['id'] == task_id:
-                task['completed'] = True
-                self.save_tasks()
+        self._ensure_loaded()
+        task = self._by_id.get(task_id)
+        if task is not None:
+            if task.completed:
                 return True
+            task.completed = True
+            self._pending.pop(task_id, None)
+            self._completed[task_id] = task
+            self._persist({'op': 'complete', 'id': task_id})
+            return True
         print(f"Task with ID {task_id} not found.")
         return False
 
@@ -123,14 +380,13 @@ class TodoTaskTool:
         Returns:
             bool: True if task was found and removed, False otherwise
         """
-        for i, task in enumerate(self.tasks):
-            if task['id'] == task_id:
-                del self.tasks[i]
-                # Reindex tasks
-                for j, t in enumerate(self.tasks, 1):
-                    t['id'] = j
-                self.save_tasks()
-                return True
+        self._ensure_loaded()
+        task = self._by_id.pop(task_id, None)
+        if task is not None:
+            self._pending.pop(task_id, None)
+            self._completed.pop(task_id, None)
+            self._persist({'op': 'remove', 'id': task_id})
+            return True
         print(f"Task with ID {task_id} not found.")
         return False
 
@@ -158,28 +414,30 @@ def main():
             priority = input("Enter priority (low/medium/high, default: medium): ") or 'medium'
             due_date = input("Enter due date (YYYY-MM-DD, optional): ") or None
             task = todo.add_task(description, priority, due_date)
-            print(f"Task added with ID {task['id']}")
+            print(f"Task added with ID {task.id}")
 
         elif choice == '2':
             tasks = todo.list_tasks()
-            for task in tasks:
-                status = "✓" if task['completed'] else " "
-                print(f"ID: {task['id']} [{status}] {task['description']} "
-                      f"(Priority: {task['priority']}, "
-                      f"Due: {task['due_date'] or 'No due date'})")
+            sys.stdout.write(''.join([
+                _ROW_ALL.format(task.id, _STATUS[task.completed], task.description,
+                                task.priority, task.due_date or 'No due date')
+                for task in tasks
+            ]))
 
         elif choice == '3':
             tasks = todo.list_tasks('completed')
-            for task in tasks:
-                print(f"ID: {task['id']} {task['description']} "
-                      f"(Priority: {task['priority']})")
+            sys.stdout.write(''.join([
+                _ROW_COMPLETED.format(task.id, task.description, task.priority)
+                for task in tasks
+            ]))
 
         elif choice == '4':
             tasks = todo.list_tasks('pending')
-            for task in tasks:
-                print(f"ID: {task['id']} {task['description']} "
-                      f"(Priority: {task['priority']}, "
-                      f"Due: {task['due_date'] or 'No due date'})")
+            sys.stdout.write(''.join([
+                _ROW_PENDING.format(task.id, task.description, task.priority,
+                                    task.due_date or 'No due date')
+                for task in tasks
+            ]))
 
         elif choice == '5':
             task_id = int(input("Enter task ID to mark complete: "))
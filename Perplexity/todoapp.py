@@ -1,38 +1,81 @@
 import os
+import sys
+from contextlib import contextmanager
 
 
 class TodoApp:
     def __init__(self):
         self.tasks = []
         self.filename = "tasks.txt"
+        self._deferred = 0
+        self._dirty = False
         self.load_tasks()
 
     def load_tasks(self):
         if os.path.exists(self.filename):
             with open(self.filename, "r") as f:
-                self.tasks = [line.strip().split("|") for line in f.readlines()]
+                data = f.read()
+            self.tasks = [line.rstrip().rsplit("|", 1)
+                          for line in data.splitlines() if line.strip()]
 
     def save_tasks(self):
-        with open(self.filename, "w") as f:
-            for task in self.tasks:
-                f.write(f"{task[0]}|{task[1]}\n")
+        if not self._dirty:
+            return
+        data = "".join([f"{task[0]}|{task[1]}\n" for task in self.tasks])
+        tmp = f"{self.filename}.tmp"
+        with open(tmp, "w") as f:
+            f.write(data)
+        os.replace(tmp, self.filename)
+        self._dirty = False
+
+    def _persist(self):
+        self._dirty = True
+        if not self._deferred:
+            self.save_tasks()
+
+    def _append_line(self, line):
+        if self._deferred:
+            self._dirty = True
+            return
+        if os.path.exists(self.filename) and os.path.getsize(self.filename) > 0:
+            with open(self.filename, "rb") as f:
+                f.seek(-1, os.SEEK_END)
+                last = f.read(1)
+            if last != b"\n":
+                # Appending would join the new task onto the last row
+                self._dirty = True
+                self.save_tasks()
+                return
+        with open(self.filename, "a") as f:
+            f.write(f"{line}\n")
+
+    @contextmanager
+    def batch(self):
+        self._deferred += 1
+        try:
+            yield self
+        finally:
+            self._deferred -= 1
+            if not self._deferred:
+                self.save_tasks()
 
     def add_task(self, task):
         self.tasks.append([task, "Pending"])
-        self.save_tasks()
+        self._append_line(f"{task}|Pending")
         print(f"Task '{task}' added successfully.")
 
     def view_tasks(self):
         if not self.tasks:
             print("No tasks found.")
         else:
-            for i, task in enumerate(self.tasks, 1):
-                print(f"{i}. {task[0]} - {task[1]}")
+            sys.stdout.write("".join(f"{i}. {task[0]} - {task[1]}\n"
+                                     for i, task in enumerate(self.tasks, 1)))
 
     def mark_complete(self, task_index):
         if 1 <= task_index <= len(self.tasks):
-            self.tasks[task_index - 1][1] = "Completed"
-            self.save_tasks()
+            if self.tasks[task_index - 1][1] != "Completed":
+                self.tasks[task_index - 1][1] = "Completed"
+                self._persist()
             print(f"Task '{self.tasks[task_index - 1][0]}' marked as completed.")
         else:
             print("Invalid task number.")
@@ -40,7 +83,7 @@ class TodoApp:
     def remove_task(self, task_index):
         if 1 <= task_index <= len(self.tasks):
             removed_task = self.tasks.pop(task_index - 1)
-            self.save_tasks()
+            self._persist()
             print(f"Task '{removed_task[0]}' removed successfully.")
         else:
             print("Invalid task number.")